@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.urls import reverse
 from django.conf import settings
 from django.contrib.auth import get_user_model # IMPORT THIS
@@ -11,9 +11,11 @@ User = get_user_model() # FIX THIS LINE
 
 class CoreModelTests(TestCase):
 
-    def setUp(self):
-        # This runs before each test
-        self.item = Item.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        # This runs once for the whole class. The database rows are restored
+        # for each test, but the objects on cls are shared, so don't modify them
+        cls.item = Item.objects.create(
             title="Test Item",
             price=100.00,
             category='S', # 'S' for 'Shirt'
@@ -26,24 +28,28 @@ class CoreModelTests(TestCase):
         self.assertEqual(self.item.price, 100.00)
         self.assertEqual(Item.objects.count(), 1)
 
+
+class CoreModelStrTests(SimpleTestCase):
+    # No database needed: these only use unsaved instances
+
     def test_item_str_method(self):
         """Test the string representation of the Item"""
-        self.assertEqual(str(self.item), "Test Item")
+        item = Item(title="Test Item")
+        self.assertEqual(str(item), "Test Item")
 
 
 class CoreViewTests(TestCase):
 
-    def setUp(self):
-        # This runs before each test
-        
+    @classmethod
+    def setUpTestData(cls):
         # 1. Create a User
-        self.user = User.objects.create_user(
+        cls.user = User.objects.create_user(
             username='testuser',
             password='testpassword123'
         )
 
         # 2. Create an Item to add to the cart
-        self.item = Item.objects.create(
+        cls.item = Item.objects.create(
             title="Test Book",
             price=50.00,
             category='SW', # 'SW' for 'Sport wear'
@@ -51,9 +57,9 @@ class CoreViewTests(TestCase):
         )
 
         # 3. Define the URLs we will be testing
-        self.add_to_cart_url = reverse('core:add-to-cart', kwargs={'slug': self.item.slug})
-        self.checkout_url = reverse('core:checkout')
-        self.login_url = reverse('account_login') # From allauth
+        cls.add_to_cart_url = reverse('core:add-to-cart', kwargs={'slug': cls.item.slug})
+        cls.checkout_url = reverse('core:checkout')
+        cls.login_url = reverse('account_login') # From allauth
 
     def test_checkout_view_unauthenticated(self):
         """
@@ -111,11 +117,10 @@ class CoreViewTests(TestCase):
         self.assertTrue(OrderItem.objects.filter(user=self.user, item=self.item).exists())
         
         # 2. An active Order (ordered=False) should exist for the user
-        self.assertTrue(Order.objects.filter(user=self.user, ordered=False).exists())
-
-        # 3. Check that the order contains the item
-        order = Order.objects.get(user=self.user, ordered=False)
-        self.assertTrue(order.items.filter(item__slug=self.item.slug).exists())
+        #    and contain the item (prefetched, so no extra query per item)
+        order = Order.objects.prefetch_related('items__item').get(user=self.user, ordered=False)
+        self.assertTrue(any(order_item.item.slug == self.item.slug
+                            for order_item in order.items.all()))
         
     def test_add_to_cart_unauthenticated(self):
         """
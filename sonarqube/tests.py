@@ -0,0 +1,236 @@
+"""
+Tests for the analytics module
+
+Run from the repository root with:
+    python -m unittest discover -s sonarqube -p tests.py
+"""
+import datetime
+import unittest
+from decimal import Decimal
+from types import SimpleNamespace
+
+from workflow import CustomerAnalytics, ProductAnalytics, SalesAnalytics, calculate_final_price
+
+
+def make_item(price, quantity, product_id=1):
+    return SimpleNamespace(product_id=product_id, price=price, quantity=quantity)
+
+
+def make_order(items, customer_id=1):
+    return SimpleNamespace(items=items, customer_id=customer_id)
+
+
+def loop_line_total(orders):
+    # Reference: the nested loop the analytics methods used originally
+    total = 0
+    for order in orders:
+        for item in order.items:
+            total = total + item.price * item.quantity
+    return total
+
+
+class LineTotalTests(unittest.TestCase):
+
+    def setUp(self):
+        self.analytics = SalesAnalytics()
+        # Prices are exact binary fractions so float sums do not depend
+        # on the order of addition
+        self.float_orders = [
+            make_order([make_item(10.5, 2), make_item(0.25, 4)], customer_id=1),
+            make_order([make_item(99.75, 1)], customer_id=2),
+            make_order([], customer_id=1),
+        ]
+        self.decimal_orders = [
+            make_order([make_item(Decimal('10.10'), 3), make_item(Decimal('0.125'), 7)],
+                       customer_id=1),
+            make_order([make_item(Decimal('0.01'), 1)], customer_id=2),
+        ]
+
+    def assertSameTotal(self, actual, expected):
+        self.assertEqual(actual, expected)
+        self.assertIs(type(actual), type(expected))
+
+    def test_total_revenue_matches_loop(self):
+        """Total revenue equals the nested loop for float and Decimal prices"""
+        for orders in (self.float_orders, self.decimal_orders):
+            self.assertSameTotal(self.analytics.calculate_total_revenue(orders),
+                                 loop_line_total(orders))
+
+    def test_total_revenue_empty(self):
+        """No orders, or orders without items, give an int 0"""
+        self.assertSameTotal(self.analytics.calculate_total_revenue([]), 0)
+        self.assertSameTotal(self.analytics.calculate_total_revenue([make_order([])]), 0)
+
+    def test_customer_lifetime_value_matches_loop(self):
+        """Lifetime value only counts the given customer's orders"""
+        for orders in (self.float_orders, self.decimal_orders):
+            customer_orders = [order for order in orders if order.customer_id == 1]
+            self.assertSameTotal(self.analytics.get_customer_lifetime_value(1, orders),
+                                 loop_line_total(customer_orders))
+        self.assertSameTotal(self.analytics.get_customer_lifetime_value(99, self.float_orders), 0)
+
+    def test_process_refunds_matches_loop(self):
+        """Refund amount equals the nested loop over the refunded items"""
+        for orders in (self.float_orders, self.decimal_orders):
+            items = orders[0].items
+            self.assertSameTotal(self.analytics.process_refunds(1, items),
+                                 loop_line_total([make_order(items)]))
+        self.assertSameTotal(self.analytics.process_refunds(1, []), 0)
+
+    def test_average_order_value_matches_loop(self):
+        """Average order value divides the loop total by the order count"""
+        for orders in (self.float_orders, self.decimal_orders):
+            self.assertSameTotal(self.analytics.calculate_average_order_value(orders),
+                                 loop_line_total(orders) / len(orders))
+        self.assertSameTotal(self.analytics.calculate_average_order_value([]), 0)
+
+
+class ProductRankingTests(unittest.TestCase):
+
+    def setUp(self):
+        # Products 2 and 3 tie on units sold; 2 is seen first
+        self.orders = [
+            make_order([make_item(1.0, 2, product_id=1), make_item(1.0, 4, product_id=2)]),
+            make_order([make_item(1.0, 4, product_id=3), make_item(1.0, 1, product_id=1)]),
+            make_order([make_item(1.0, 5, product_id=4)]),
+        ]
+
+    def test_top_products_ranked_by_units_sold(self):
+        """Products are ranked by units sold, ties in first-seen order"""
+        analytics = SalesAnalytics()
+        self.assertEqual(analytics.get_top_products(self.orders, limit=3),
+                         [(4, 5), (2, 4), (3, 4)])
+        self.assertEqual(analytics.get_top_products(self.orders, limit=10),
+                         [(4, 5), (2, 4), (3, 4), (1, 3)])
+        self.assertEqual(analytics.get_top_products([]), [])
+
+    def test_recommendations_count_co_purchases(self):
+        """Products bought with the given one are ranked by shared orders"""
+        orders = [
+            make_order([make_item(1.0, 1, product_id=pid) for pid in (1, 5, 6)]),
+            make_order([make_item(1.0, 1, product_id=pid) for pid in (6, 1, 7, 5)]),
+            make_order([make_item(1.0, 1, product_id=pid) for pid in (1, 8)]),
+            make_order([make_item(1.0, 1, product_id=pid) for pid in (5, 9)]),
+        ]
+        recommendations = ProductAnalytics().get_product_recommendations(1, orders)
+        self.assertEqual(recommendations, [(5, 2), (6, 2), (7, 1), (8, 1)])
+        self.assertEqual(ProductAnalytics().get_product_recommendations(42, orders), [])
+
+    def test_product_performance_totals(self):
+        """Units sold, revenue and average price only count the given product"""
+        orders = [
+            make_order([make_item(Decimal('2.50'), 2, product_id=1),
+                        make_item(Decimal('9.99'), 1, product_id=2)]),
+            make_order([make_item(Decimal('3.25'), 2, product_id=1)]),
+        ]
+        metrics = ProductAnalytics().analyze_product_performance(1, orders)
+        self.assertEqual(metrics, {
+            'total_sold': 4,
+            'total_revenue': Decimal('11.50'),
+            'average_price': Decimal('2.875'),
+            'return_rate': 0,
+        })
+
+    def test_product_performance_without_sales(self):
+        """A product with no sales keeps zeroed metrics"""
+        metrics = ProductAnalytics().analyze_product_performance(42, self.orders)
+        self.assertEqual(metrics, {
+            'total_sold': 0,
+            'total_revenue': 0,
+            'average_price': 0,
+            'return_rate': 0,
+        })
+        self.assertIs(type(metrics['total_revenue']), int)
+
+
+class MonthlyReportTests(unittest.TestCase):
+
+    def setUp(self):
+        self.analytics = SalesAnalytics()
+
+    def test_daily_sales_covers_every_day(self):
+        """daily_sales has one zero entry per day of the month"""
+        daily_sales = self.analytics.generate_monthly_report(2024, 2)['daily_sales']
+        self.assertEqual(len(daily_sales), 29)
+        self.assertEqual(next(iter(daily_sales)), '2024-02-01')
+        self.assertEqual(list(daily_sales)[-1], '2024-02-29')
+        self.assertEqual(set(daily_sales.values()), {0})
+        self.assertEqual(len(self.analytics.generate_monthly_report(2023, 2)['daily_sales']), 28)
+
+    def test_daily_sales_is_not_shared(self):
+        """Filling in one report does not leak into the next"""
+        report = self.analytics.generate_monthly_report(2024, 3)
+        report['daily_sales']['2024-03-01'] = 10
+        self.assertEqual(self.analytics.generate_monthly_report(2024, 3)['daily_sales']['2024-03-01'], 0)
+
+    def test_invalid_month_or_year_has_no_days(self):
+        """Out-of-range months and years give an empty daily_sales"""
+        for year, month in ((2024, 0), (2024, 13), (0, 1), (10000, 1)):
+            self.assertEqual(self.analytics.generate_monthly_report(year, month)['daily_sales'], {})
+
+
+class SegmentCustomersTests(unittest.TestCase):
+
+    def test_segments_follow_thresholds(self):
+        """Customers are bucketed on spend strictly above each threshold"""
+        def customer(price, quantity=1):
+            return SimpleNamespace(orders=[make_order([make_item(price, quantity)])])
+
+        high = customer(Decimal('500.50'), 2)
+        medium = customer(1000.0)
+        low = customer(100.5)
+        inactive = customer(Decimal('100'))
+        no_orders = SimpleNamespace(orders=[])
+
+        segments = CustomerAnalytics().segment_customers(
+            [high, medium, low, inactive, no_orders])
+
+        self.assertEqual(segments, {
+            'high_value': [high],
+            'medium_value': [medium],
+            'low_value': [low],
+            'inactive': [inactive, no_orders],
+        })
+
+
+class ChurnRateTests(unittest.TestCase):
+
+    def test_churn_counts_customers_without_recent_orders(self):
+        """Customers whose latest order is older than the window, or who never ordered, churn"""
+        now = datetime.datetime.now()
+
+        def customer(*days_ago):
+            return SimpleNamespace(orders=[
+                SimpleNamespace(created_at=now - datetime.timedelta(days=days))
+                for days in days_ago])
+
+        customers = [
+            customer(200, 10, 120),  # latest order is recent
+            customer(100, 200),
+            customer(),
+            customer(5),
+        ]
+        self.assertEqual(CustomerAnalytics().calculate_churn_rate(customers, days=90), 50.0)
+
+    def test_churn_with_no_customers(self):
+        """An empty customer list has a churn rate of 0"""
+        self.assertEqual(CustomerAnalytics().calculate_churn_rate([]), 0)
+
+
+class FinalPriceTests(unittest.TestCase):
+
+    def test_final_price_applies_discount_then_tax(self):
+        """Discount is taken off first, then tax is added to the rest"""
+        self.assertEqual(calculate_final_price(100, 10, 20), 108.0)
+        self.assertEqual(calculate_final_price(272.5, 10, 10), 269.775)
+        self.assertEqual(calculate_final_price(Decimal('19.99'), Decimal('15'), Decimal('8')),
+                         Decimal('18.35082'))
+
+    def test_final_price_without_discount_or_tax(self):
+        """Zero discount and tax leave the price unchanged"""
+        self.assertEqual(calculate_final_price(0.1, 0, 0), 0.1)
+        self.assertEqual(calculate_final_price(Decimal('0.10'), Decimal('0'), Decimal('0')), Decimal('0.10'))
+
+
+if __name__ == '__main__':
+    unittest.main()
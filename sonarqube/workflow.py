@@ -1,26 +1,51 @@
 """
 Analytics module for e-commerce platform
 This file contains intentional code patterns for SonarQube analysis
+
+The analytics take plain objects rather than core models: an order has an
+iterable ``items`` (plus ``customer_id`` and ``created_at``), each item has
+``product_id``, ``price`` and ``quantity``, and a customer has an iterable
+``orders``.
 """
+import calendar
 import datetime
+import heapq
 from decimal import Decimal
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
+
+# Minimum spend (exclusive) for each customer segment, highest first
+SEGMENT_THRESHOLDS = (
+    (1000, 'high_value'),
+    (500, 'medium_value'),
+    (100, 'low_value'),
+)
+
+
+def _line_total(items):
+    """Sum price * quantity over the given order items"""
+    # sum() starts from int 0, so the result has the type of item.price
+    # (int 0 when there are no items)
+    return sum(item.price * item.quantity for item in items)
+
+
+@lru_cache(maxsize=128)
+def _month_days(year, month):
+    """Return the ISO date strings for every day of the given month"""
+    # Out-of-range months and years have no days, rather than raising
+    if not (1 <= month <= 12 and datetime.MINYEAR <= year <= datetime.MAXYEAR):
+        return ()
+    _, ndays = calendar.monthrange(year, month)
+    return tuple(str(datetime.date(year, month, day)) for day in range(1, ndays + 1))
 
 
 class SalesAnalytics:
     """Analytics for sales data"""
     
-    def __init__(self):
-        self.sales_data = []
-        self.customer_data = []
-        self.product_data = []
-    
     def calculate_total_revenue(self, orders):
         """Calculate total revenue from orders"""
-        total = 0
-        for order in orders:
-            for item in order.items:
-                total = total + item.price * item.quantity
-        return total
+        return _line_total(chain.from_iterable(order.items for order in orders))
     
     def calculate_average_order_value(self, orders):
         """Calculate average order value"""
@@ -28,33 +53,26 @@ class SalesAnalytics:
         count = 0
         for order in orders:
             for item in order.items:
-                total = total + item.price * item.quantity
-            count = count + 1
+                total += item.price * item.quantity
+            count += 1
         if count == 0:
             return 0
         return total / count
     
     def get_top_products(self, orders, limit=10):
-        """Get top selling products"""
+        """Get top selling products (a negative limit returns none)"""
         product_sales = {}
+        get_sold = product_sales.get
         for order in orders:
             for item in order.items:
-                if item.product_id in product_sales:
-                    product_sales[item.product_id] = product_sales[item.product_id] + item.quantity
-                else:
-                    product_sales[item.product_id] = item.quantity
+                product_sales[item.product_id] = get_sold(item.product_id, 0) + item.quantity
         
-        sorted_products = sorted(product_sales.items(), key=lambda x: x[1], reverse=True)
-        return sorted_products[:limit]
+        return heapq.nlargest(limit, product_sales.items(), key=itemgetter(1))
     
     def get_customer_lifetime_value(self, customer_id, orders):
         """Calculate customer lifetime value"""
-        total = 0
-        for order in orders:
-            if order.customer_id == customer_id:
-                for item in order.items:
-                    total = total + item.price * item.quantity
-        return total
+        return _line_total(chain.from_iterable(
+            order.items for order in orders if order.customer_id == customer_id))
     
     def generate_monthly_report(self, year, month):
         """Generate monthly sales report"""
@@ -68,32 +86,18 @@ class SalesAnalytics:
         report['average_order_value'] = 0
         report['top_products'] = []
         report['top_customers'] = []
-        report['daily_sales'] = {}
-        
-        # Complex nested logic
-        for day in range(1, 32):
-            try:
-                date = datetime.date(year, month, day)
-                report['daily_sales'][str(date)] = 0
-            except:
-                pass
+        report['daily_sales'] = dict.fromkeys(_month_days(year, month), 0)
         
         return report
     
     def process_refunds(self, order_id, items):
         """Process refund for order items"""
-        refund_amount = 0
-        for item in items:
-            refund_amount = refund_amount + item.price * item.quantity
-        return refund_amount
+        return _line_total(items)
 
 
 class CustomerAnalytics:
     """Analytics for customer behavior"""
     
-    def __init__(self):
-        self.customer_segments = []
-    
     def segment_customers(self, customers):
         """Segment customers based on purchase behavior"""
         segments = {
@@ -107,16 +111,13 @@ class CustomerAnalytics:
             total_spent = 0
             for order in customer.orders:
                 for item in order.items:
-                    total_spent = total_spent + item.price * item.quantity
-            
-            if total_spent > 1000:
-                segments['high_value'].append(customer)
-            elif total_spent > 500:
-                segments['medium_value'].append(customer)
-            elif total_spent > 100:
-                segments['low_value'].append(customer)
-            else:
-                segments['inactive'].append(customer)
+                    total_spent += item.price * item.quantity
+            segment = 'inactive'
+            for threshold, name in SEGMENT_THRESHOLDS:
+                if total_spent > threshold:
+                    segment = name
+                    break
+            segments[segment].append(customer)
         
         return segments
     
@@ -169,28 +170,18 @@ class ProductAnalytics:
     
     def get_product_recommendations(self, product_id, all_orders):
         """Get product recommendations based on purchase history"""
-        # Complex logic that could be simplified
         related_products = {}
+        get_count = related_products.get
         
         for order in all_orders:
-            has_product = False
-            order_products = []
-            
-            for item in order.items:
-                order_products.append(item.product_id)
-                if item.product_id == product_id:
-                    has_product = True
-            
-            if has_product:
-                for prod_id in order_products:
-                    if prod_id != product_id:
-                        if prod_id in related_products:
-                            related_products[prod_id] = related_products[prod_id] + 1
-                        else:
-                            related_products[prod_id] = 1
+            order_products = [item.product_id for item in order.items]
+            if product_id not in order_products:
+                continue
+            for prod_id in order_products:
+                if prod_id != product_id:
+                    related_products[prod_id] = get_count(prod_id, 0) + 1
         
-        sorted_recommendations = sorted(related_products.items(), key=lambda x: x[1], reverse=True)
-        return sorted_recommendations[:5]
+        return heapq.nlargest(5, related_products.items(), key=itemgetter(1))
 
 
 def calculate_discount_amount(price, discount_percentage):
@@ -210,4 +201,4 @@ def calculate_final_price(price, discount_percentage, tax_rate):
     price_after_discount = price - discount
     tax = price_after_discount * (tax_rate / 100)
     final_price = price_after_discount + tax
-    return final_price
\ No newline at end of file
+    return final_price